@@ -1,29 +1,61 @@
+import io
 import os
+import errno
+import re
 import csv
+import mmap
+import json
+import hashlib
 import codecs
 import logging
+import shutil
+import signal
+import tempfile
+import threading
+import multiprocessing
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from collections import Counter, OrderedDict
 from datetime import datetime
 import argparse
-from typing import List, Tuple, Optional
+from typing import BinaryIO, Callable, Dict, Iterator, List, NamedTuple, Pattern, Set, Tuple, Optional, Union
 from pathlib import Path
 
 
-def detect_encoding(file_path: str) -> Optional[str]:
+# Files at least this large are checked for matches through a memory map before being read.
+MMAP_THRESHOLD = 1024 * 1024
+# Files at least this large are streamed in chunks instead of being read into memory.
+STREAM_THRESHOLD = 8 * 1024 * 1024
+CHUNK_SIZE = 1024 * 1024
+# Number of modified files whose temporary files are flushed and moved into place together.
+COMMIT_BATCH_SIZE = 128
+CACHE_FILE_NAME = ".batrepl-cache.json"
+# Upper bound on the replaced content kept for duplicate files, per worker process.
+REPLACE_CACHE_LIMIT = 32 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+def decode_text(data: bytes) -> Optional[str]:
     """
-    Detects the encoding of a given file by attempting to read it with UTF-8 and Shift-JIS.
+    Decodes file content with its detected encoding.
+
+    A UTF-8 byte order mark selects "utf-8-sig". Otherwise the data is decoded as UTF-8,
+    and as Shift-JIS if that fails.
 
     Args:
-        file_path (str): Path to the file to be checked.
+        data (bytes): Raw content of the file.
 
     Returns:
-        Optional[str]: Detected encoding if successful, None otherwise.
+        Optional[str]: Decoded text if successful, None otherwise.
     """
-    encodings = ["utf-8", "shift-jis"]
+    if data.startswith(codecs.BOM_UTF8):
+        encodings = ["utf-8-sig"]
+    else:
+        encodings = ["utf-8", "shift-jis"]
     for encoding in encodings:
         try:
-            with codecs.open(file_path, "r", encoding=encoding) as f:
-                f.read()
-            return encoding
+            return data.decode(encoding)
         except UnicodeDecodeError:
             continue
     return None
@@ -33,6 +65,8 @@ def read_replace_pairs(csv_file: str) -> List[Tuple[str, str]]:
     """
     Reads replacement pairs from a CSV file and logs any additional notes found.
 
+    The file is read once and decoded in memory.
+
     Args:
         csv_file (str): Path to the CSV file.
 
@@ -42,58 +76,823 @@ def read_replace_pairs(csv_file: str) -> List[Tuple[str, str]]:
     Raises:
         ValueError: If the file encoding cannot be detected.
     """
-    encoding = detect_encoding(csv_file)
-    if encoding is None:
+    with open(csv_file, "rb") as f:
+        text = decode_text(f.read())
+    if text is None:
         raise ValueError("Unable to detect file encoding for the CSV file.")
 
     replace_pairs = []
-    with codecs.open(csv_file, "r", encoding=encoding) as f:
-        reader = csv.reader(f, skipinitialspace=True, quotechar='"', doublequote=True)
-        for row in reader:
-            if len(row) >= 2:
-                before_replace = row[0].replace('""', '"')
-                after_replace = row[1].replace('""', '"')
-                replace_pairs.append((before_replace, after_replace))
-
-                if len(row) > 2:
-                    third_column = row[2]
-                    logging.info(f"Note: {third_column}")
+    reader = csv.reader(io.StringIO(text, newline=""), skipinitialspace=True, quotechar='"', doublequote=True)
+    for row in reader:
+        if len(row) >= 2:
+            before_replace = row[0].replace('""', '"')
+            after_replace = row[1].replace('""', '"')
+            replace_pairs.append((before_replace, after_replace))
+
+            if len(row) > 2:
+                third_column = row[2]
+                logger.info("Note: %s", third_column)
 
     return replace_pairs
 
 
-def find_and_replace_in_file(file_path: str, find_text: str, replace_text: str) -> None:
+class ReplaceRules(NamedTuple):
+    """
+    Replacement pairs compiled for matching on UTF-8 encoded bytes.
+
+    Attributes:
+        pattern (Pattern[bytes]): Compiled pattern matching every find text.
+        replace_map (Dict[bytes, bytes]): Mapping of find text to replace text.
+        find_bytes (Tuple[bytes, ...]): Find texts, longest first.
+        overlap (int): Number of trailing bytes kept between chunks so that matches spanning
+            a chunk boundary are found.
+    """
+
+    pattern: Pattern[bytes]
+    replace_map: Dict[bytes, bytes]
+    find_bytes: Tuple[bytes, ...]
+    overlap: int
+
+
+def build_trie_pattern(finds: Tuple[bytes, ...]) -> bytes:
+    """
+    Builds a regular expression matching any of the given byte strings, factored as a trie.
+
+    Find texts sharing a prefix share a single branch of the expression, so the regex
+    engine checks each input position against the distinct next bytes only instead of
+    retrying every find text in turn. Optional tails are greedy, so the longest find text
+    matching at a position wins.
+
+    Args:
+        finds (Tuple[bytes, ...]): Non-empty byte strings to match.
+
+    Returns:
+        bytes: Regular expression source.
+    """
+    trie: Dict[Optional[int], dict] = {}
+    for find in finds:
+        node = trie
+        for byte in find:
+            node = node.setdefault(byte, {})
+        node[None] = {}
+
+    def to_regex(node: Dict[Optional[int], dict]) -> bytes:
+        prefix = bytearray()
+        while len(node) == 1 and None not in node:
+            byte, node = next(iter(node.items()))
+            prefix.append(byte)
+
+        terminal = None in node
+        children = sorted(byte for byte in node if byte is not None)
+        leaves = bytes(byte for byte in children if list(node[byte]) == [None])
+        branches = [re.escape(bytes([byte])) + to_regex(node[byte]) for byte in children if byte not in leaves]
+        if len(leaves) == 1:
+            branches.append(re.escape(leaves))
+        elif leaves:
+            branches.append(b"[" + re.escape(leaves) + b"]")
+
+        source = re.escape(bytes(prefix))
+        if len(branches) == 1 and not terminal:
+            return source + branches[0]
+        if branches:
+            source += b"(?:" + b"|".join(branches) + b")" + (b"?" if terminal else b"")
+        return source
+
+    return to_regex(trie)
+
+
+def compile_replace_pairs(find_replace_pairs: List[Tuple[str, str]]) -> ReplaceRules:
+    """
+    Compiles the replacement pairs into a single trie-shaped pattern matching every UTF-8
+    encoded find text.
+
+    Overlapping find texts prefer the longest match. When the same find text appears more
+    than once, the first pair wins.
+
+    Args:
+        find_replace_pairs (List[Tuple[str, str]]): List of find and replace text tuples.
+
+    Returns:
+        ReplaceRules: Compiled pattern, replacement mapping and encoded find texts.
+    """
+    replace_map: Dict[bytes, bytes] = {}
+    for find_text, replace_text in find_replace_pairs:
+        if not find_text:
+            logger.warning("Ignored empty find text for '%s'.", replace_text)
+            continue
+        replace_map.setdefault(find_text.encode("utf-8"), replace_text.encode("utf-8"))
+
+    find_bytes = tuple(sorted(replace_map, key=len, reverse=True))
+    try:
+        pattern = re.compile(build_trie_pattern(find_bytes))
+    except RecursionError:
+        # Deeply nested find texts (e.g. "a", "aa", "aaa", ...) exceed the recursion limit of
+        # the trie builder or the regex parser; a longest-first alternation matches the same.
+        logger.debug("Find texts are nested too deeply for a trie pattern; using an alternation.")
+        pattern = re.compile(b"|".join(re.escape(find) for find in find_bytes))
+    return ReplaceRules(pattern, replace_map, find_bytes, len(find_bytes[0]) - 1)
+
+
+def make_replacer(rules: ReplaceRules, replace_counts: Counter) -> Callable[["re.Match[bytes]"], bytes]:
+    """
+    Creates the replacement function passed to the compiled pattern.
+
+    Args:
+        rules (ReplaceRules): Compiled replacement pairs.
+        replace_counts (Counter): Counter updated with the number of replacements per find text.
+
+    Returns:
+        Callable[[re.Match[bytes]], bytes]: Function returning the replace text for a match.
+    """
+    lookup = rules.replace_map.__getitem__
+
+    def replace_match(match: "re.Match[bytes]") -> bytes:
+        find = match[0]
+        replace_counts[find] += 1
+        return lookup(find)
+
+    return replace_match
+
+
+def find_first_match(data: Union[bytes, mmap.mmap], rules: ReplaceRules) -> int:
+    """
+    Finds the position of the first find text in a block of bytes.
+
+    A single find text is looked up with the C substring search. Several find texts are
+    checked in one left-to-right pass of the trie-shaped pattern, whose cost does not grow
+    with the number of find texts, instead of one full scan per find text.
+
+    Args:
+        data (Union[bytes, mmap.mmap]): Data to be checked.
+        rules (ReplaceRules): Compiled replacement pairs.
+
+    Returns:
+        int: Offset of the first match, or -1 if no find text occurs in the data.
+    """
+    if len(rules.find_bytes) == 1:
+        return data.find(rules.find_bytes[0])
+    match = rules.pattern.search(data)
+    return match.start() if match else -1
+
+
+def replace_all(data: bytes, rules: ReplaceRules, replace_counts: Counter, start: int = 0) -> bytes:
+    """
+    Replaces every find text in a block of bytes.
+
+    A single find text is replaced with bytes.replace, whose C substring search avoids a
+    Python-level call per match. Several find texts go through the compiled pattern, which
+    resumes at the first match so the bytes before it are not scanned again.
+
+    Args:
+        data (bytes): Data to be processed.
+        rules (ReplaceRules): Compiled replacement pairs.
+        replace_counts (Counter): Counter updated with the number of replacements per find text.
+        start (int): Offset of the first match, as returned by find_first_match.
+
+    Returns:
+        bytes: Data with every find text replaced.
+    """
+    if len(rules.find_bytes) == 1:
+        find = rules.find_bytes[0]
+        count = data.count(find, start)
+        if count:
+            replace_counts[find] += count
+        return data.replace(find, rules.replace_map[find])
+
+    replaced = rules.pattern.sub(make_replacer(rules, replace_counts), data[start:] if start else data)
+    return data[:start] + replaced if start else replaced
+
+
+def is_modified(rules: ReplaceRules, replace_counts: Counter) -> bool:
     """
-    Performs find and replace in a file with UTF-8 error handling and logs the result.
+    Checks whether the counted replacements changed the content.
+
+    This avoids comparing the whole old and new content when every replacement found
+    maps a find text to itself.
+
+    Args:
+        rules (ReplaceRules): Compiled replacement pairs.
+        replace_counts (Counter): Number of replacements per find text.
+
+    Returns:
+        bool: True if at least one replacement differs from its find text.
+    """
+    return any(rules.replace_map[find] != find for find in replace_counts)
+
+
+class ReplaceCache:
+    """
+    Least recently used cache of replaced file contents keyed by a digest of the original content.
+
+    Files with identical content, such as vendored scripts copied across a tree, are only
+    scanned once per worker process. Access is serialized so that worker threads can share it.
+
+    Attributes:
+        max_bytes (int): Upper bound on the total size of the cached contents.
+        entries (OrderedDict): Replaced content and replacement counts keyed by digest.
+        size (int): Current total size of the cached contents.
+        lock (threading.Lock): Lock guarding entries and size.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[bytes, Tuple[bytes, Counter]]" = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key: bytes) -> Optional[Tuple[bytes, Counter]]:
+        """
+        Returns the cached result for a digest and marks it as recently used.
+
+        Args:
+            key (bytes): Digest of the original content.
+
+        Returns:
+            Optional[Tuple[bytes, Counter]]: Replaced content and replacement counts, or None.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key: bytes, new_data: bytes, replace_counts: Counter) -> None:
+        """
+        Stores a result, evicting the least recently used entries beyond max_bytes.
+
+        Args:
+            key (bytes): Digest of the original content.
+            new_data (bytes): Replaced content.
+            replace_counts (Counter): Number of replacements per find text.
+        """
+        if len(new_data) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                return
+            self.entries[key] = (new_data, replace_counts)
+            self.size += len(new_data)
+            while self.size > self.max_bytes:
+                _, (evicted_data, _) = self.entries.popitem(last=False)
+                self.size -= len(evicted_data)
+
+
+replace_cache = ReplaceCache(REPLACE_CACHE_LIMIT)
+# Replacement pairs of the current worker, set once by initialize_worker.
+worker_rules: Optional[ReplaceRules] = None
+
+
+def read_fd(fd: int, size: int) -> bytes:
+    """
+    Reads up to size bytes from the start of an open file descriptor.
+
+    Args:
+        fd (int): File descriptor opened for reading.
+        size (int): Number of bytes to read, usually the size reported by os.fstat.
+
+    Returns:
+        bytes: Data read from the file.
+    """
+    chunks = []
+    while size > 0:
+        chunk = os.read(fd, size)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def has_mapped_match(fd: int, rules: ReplaceRules) -> bool:
+    """
+    Checks whether any find text occurs in a file through a read-only memory map.
+
+    The search runs directly on the page cache, so files without a match are never copied
+    into memory. The map is closed before returning so that the file can be replaced.
+
+    Args:
+        fd (int): File descriptor of a non-empty file opened for reading.
+        rules (ReplaceRules): Compiled replacement pairs.
+
+    Returns:
+        bool: True if at least one find text occurs in the file.
+    """
+    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mapped:
+        return find_first_match(mapped, rules) >= 0
+
+
+def sync_file(target: BinaryIO) -> None:
+    """
+    Flushes a temporary file to disk on platforms without os.sync, such as Windows.
+
+    Elsewhere the whole batch is flushed at once by commit_replacements.
+
+    Args:
+        target (BinaryIO): Temporary file opened for writing.
+    """
+    if not hasattr(os, "sync"):
+        target.flush()
+        os.fsync(target.fileno())
+
+
+def open_temp_file(temp_path: str) -> BinaryIO:
+    """
+    Opens the temporary file that receives the new content of a file.
+
+    If the directory of the file is not writable, a file in the system temporary directory
+    is opened instead, and its content is later written over the original file in place.
+
+    Args:
+        temp_path (str): Path of the temporary file next to the original file.
+
+    Returns:
+        BinaryIO: Temporary file opened for writing. Its name is the path actually used.
+    """
+    try:
+        return open(temp_path, "wb")
+    except PermissionError:
+        fd, fallback_path = tempfile.mkstemp(prefix="batrepl.")
+        os.close(fd)
+        return open(fallback_path, "wb")
+
+
+def replace_in_memory(
+    fd: int, size: int, rules: ReplaceRules, replace_counts: Counter, temp_path: str
+) -> Optional[str]:
+    """
+    Reads a whole file into memory, replaces every find text and writes the result to a
+    temporary file.
+
+    Results are reused for files whose content was already processed by this worker.
+
+    Args:
+        fd (int): File descriptor opened for reading.
+        size (int): Size of the file in bytes.
+        rules (ReplaceRules): Compiled replacement pairs.
+        replace_counts (Counter): Counter updated with the number of replacements per find text.
+        temp_path (str): Path of the temporary file written if the content changed.
+
+    Returns:
+        Optional[str]: Path of the temporary file written, or None if the content did not change.
+    """
+    # A file shorter than the shortest find text cannot match, so it is not even read.
+    if size < len(rules.find_bytes[-1]):
+        return None
+
+    data = read_fd(fd, size)
+    first_match = find_first_match(data, rules)
+    if first_match < 0:
+        return None
+
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    cached = replace_cache.get(digest)
+    if cached is None:
+        file_counts: Counter = Counter()
+        new_data = replace_all(data, rules, file_counts, first_match)
+        replace_cache.put(digest, new_data, file_counts)
+    else:
+        new_data, file_counts = cached
+    replace_counts.update(file_counts)
+
+    if not is_modified(rules, file_counts):
+        return None
+
+    target = open_temp_file(temp_path)
+    try:
+        with target:
+            target.write(new_data)
+            sync_file(target)
+    except BaseException:
+        remove_file(target.name)
+        raise
+    return target.name
+
+
+def replace_streaming(
+    file_path: str, rules: ReplaceRules, replace_counts: Counter, temp_path: str
+) -> Optional[str]:
+    """
+    Replaces every find text in a file chunk by chunk and writes the result to a temporary file.
+
+    The last overlap bytes of each chunk are carried over to the next one so that matches
+    spanning a chunk boundary are found. The temporary file is removed if the content did
+    not change.
 
     Args:
         file_path (str): Path to the file to be processed.
-        find_text (str): Text to find in the file.
-        replace_text (str): Text to replace the found text with.
+        rules (ReplaceRules): Compiled replacement pairs.
+        replace_counts (Counter): Counter updated with the number of replacements per find text.
+        temp_path (str): Path of the temporary file.
+
+    Returns:
+        Optional[str]: Path of the temporary file written, or None if the content did not change.
+    """
+    replace_match = make_replacer(rules, replace_counts)
+
+    with open(file_path, "rb") as source:
+        target = open_temp_file(temp_path)
+        try:
+            with target:
+                buffer = b""
+                while True:
+                    chunk = source.read(CHUNK_SIZE)
+                    buffer += chunk
+                    # Only matches starting before the limit are guaranteed to be complete.
+                    limit = len(buffer) - rules.overlap if chunk else len(buffer)
+                    position = 0
+                    for match in rules.pattern.finditer(buffer):
+                        if match.start() >= limit:
+                            break
+                        target.write(buffer[position:match.start()])
+                        target.write(replace_match(match))
+                        position = match.end()
+
+                    cut = max(position, limit)
+                    target.write(buffer[position:cut])
+                    buffer = buffer[cut:]
+                    if not chunk:
+                        break
+
+                if is_modified(rules, replace_counts):
+                    sync_file(target)
+        except BaseException:
+            remove_file(target.name)
+            raise
+
+    if not is_modified(rules, replace_counts):
+        remove_file(target.name)
+        return None
+    return target.name
+
+
+def remove_file(file_path: str) -> None:
+    """
+    Removes a file, ignoring a file that does not exist.
+
+    Args:
+        file_path (str): Path to the file.
     """
     try:
-        with open(file_path, "r", encoding="utf-8-sig", errors="replace") as file:
-            content = file.read()
+        os.remove(file_path)
+    except FileNotFoundError:
+        pass
+
+
+def copy_metadata(file_path: str, file_stat: os.stat_result, temp_path: str) -> bool:
+    """
+    Gives a temporary file the ownership, permissions and extended attributes of the original.
+
+    The temporary file keeps its own modification time, since its content is new.
+
+    Args:
+        file_path (str): Path to the original file.
+        file_stat (os.stat_result): Status of the original file.
+        temp_path (str): Path to the temporary file.
+
+    Returns:
+        bool: False if the ownership could not be copied, in which case nothing else is.
+    """
+    if hasattr(os, "chown"):
+        temp_stat = os.stat(temp_path)
+        if (temp_stat.st_uid, temp_stat.st_gid) != (file_stat.st_uid, file_stat.st_gid):
+            try:
+                os.chown(temp_path, file_stat.st_uid, file_stat.st_gid)
+            except PermissionError:
+                return False
+    shutil.copystat(file_path, temp_path)
+    os.utime(temp_path)
+    return True
+
+
+def write_in_place(temp_path: str, file_path: str) -> None:
+    """
+    Copies the content of a temporary file over the original file in place and removes it.
+
+    Args:
+        temp_path (str): Path to the temporary file.
+        file_path (str): Path to the original file.
+    """
+    with open(temp_path, "rb") as source, open(file_path, "r+b") as target:
+        shutil.copyfileobj(source, target, CHUNK_SIZE)
+        target.truncate()
+    remove_file(temp_path)
+
+
+class FileResult(NamedTuple):
+    """
+    Outcome of processing a single file.
+
+    Attributes:
+        file_path (str): Path to the processed file.
+        processed (bool): True if the file was processed without error.
+        temp_path (Optional[str]): Temporary file holding the new content, to be moved over
+            the original by commit_replacements, or None if the file did not change.
+    """
 
-        new_content = content.replace(find_text, replace_text)
+    file_path: str
+    processed: bool
+    temp_path: Optional[str]
 
-        if new_content != content:
-            with open(file_path, "w", encoding="utf-8-sig") as file:
-                file.write(new_content)
-            logging.info(f"Replaced '{find_text}' with '{replace_text}' in {file_path}")
-        else:
-            logging.debug(f"No change for '{find_text}' in {file_path}.")
+
+def find_and_replace_in_file(file_path: str, rules: ReplaceRules) -> FileResult:
+    """
+    Replaces every find text in a file in a single pass and logs the result.
+
+    Matching is done on the raw bytes, so bytes outside the matches are left untouched.
+    Files of MMAP_THRESHOLD or more are first checked through a memory map and skipped if
+    nothing matches. Files smaller than STREAM_THRESHOLD are read into memory, larger files
+    are streamed in chunks. The new content is written to a sibling temporary file, and the
+    original file is left untouched until the caller moves it into place. Files with other
+    hard links, whose owner cannot be given to the temporary file, or whose directory is not
+    writable are instead rewritten in place.
+
+    Args:
+        file_path (str): Path to the file to be processed.
+        rules (ReplaceRules): Compiled replacement pairs.
+
+    Returns:
+        FileResult: Whether the file was processed and the temporary file to move into place.
+    """
+    temp_path: Optional[str] = f"{file_path}.batrepl.{os.getpid()}"
+    try:
+        replace_counts: Counter = Counter()
+        fd = os.open(file_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            file_stat = os.fstat(fd)
+            size = file_stat.st_size
+            matched = size < MMAP_THRESHOLD or has_mapped_match(fd, rules)
+            written_path = None
+            if matched and size < STREAM_THRESHOLD:
+                written_path = replace_in_memory(fd, size, rules, replace_counts, temp_path)
+        finally:
+            os.close(fd)
+
+        if matched and size >= STREAM_THRESHOLD:
+            written_path = replace_streaming(file_path, rules, replace_counts, temp_path)
+
+        if written_path is None:
+            return FileResult(file_path, True, None)
+
+        in_place = written_path != temp_path
+        temp_path = written_path
+        if not os.access(file_path, os.W_OK):
+            raise PermissionError(errno.EACCES, os.strerror(errno.EACCES), file_path)
+        # Replacing the file would detach it from its other hard links, or change its owner,
+        # and is not possible when the temporary file is not in the same directory.
+        if in_place or file_stat.st_nlink > 1 or not copy_metadata(file_path, file_stat, temp_path):
+            write_in_place(temp_path, file_path)
+            temp_path = None
+
+        if logger.isEnabledFor(logging.INFO):
+            replacements = "; ".join(
+                f"'{find.decode('utf-8')}' with '{rules.replace_map[find].decode('utf-8')}' ({count})"
+                for find, count in replace_counts.items()
+                if rules.replace_map[find] != find
+            )
+            logger.info("Replaced %s in %s", replacements, file_path)
+        return FileResult(file_path, True, temp_path)
 
     except PermissionError as e:
-        logging.error(f"Permission error while processing {file_path}: {e}.")
+        logger.error("Permission error while processing %s: %s.", file_path, e)
     except Exception as e:
-        logging.error(f"An error occurred while processing {file_path}: {e}.")
+        logger.error("An error occurred while processing %s: %s.", file_path, e)
+    if temp_path is not None:
+        remove_file(temp_path)
+    return FileResult(file_path, False, None)
+
+
+def commit_replacements(replacements: List[Tuple[str, str]]) -> List[str]:
+    """
+    Moves a batch of temporary files over their original files.
+
+    The data of the whole batch is flushed to disk with a single os.sync call where the
+    platform provides it (elsewhere each temporary file was flushed when written), then
+    each temporary file atomically replaces its original. A crash before this point leaves
+    the original files untouched.
+
+    Args:
+        replacements (List[Tuple[str, str]]): Pairs of temporary file path and original file path.
+
+    Returns:
+        List[str]: Original file paths that could not be replaced.
+    """
+    if replacements and hasattr(os, "sync"):
+        os.sync()
+
+    failed_paths = []
+    for temp_path, file_path in replacements:
+        try:
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            logger.error("An error occurred while replacing %s: %s.", file_path, e)
+            remove_file(temp_path)
+            failed_paths.append(file_path)
+    return failed_paths
+
+
+def iter_target_files(
+    directory: str, suffixes: Tuple[str, ...], seen: Optional[Set[Tuple[int, int]]] = None
+) -> Iterator[str]:
+    """
+    Recursively yields the files in a directory whose name ends with one of the suffixes.
+
+    Uses os.scandir so that file and directory checks rely on the cached directory entry
+    type instead of an additional stat call per entry. Symbolic links are not followed.
+    A file with several hard links under the directory is yielded only once, so that no
+    two workers rewrite the same file at the same time.
+
+    Args:
+        directory (str): Directory to be scanned.
+        suffixes (Tuple[str, ...]): Lowercase file extensions to include.
+        seen (Optional[Set[Tuple[int, int]]]): Device and inode numbers of the files already
+            yielded, shared by the recursive calls.
+
+    Yields:
+        str: Path of each matching file.
+    """
+    if seen is None:
+        seen = set()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from iter_target_files(entry.path, suffixes, seen)
+                elif entry.is_file(follow_symlinks=False) and entry.name.lower().endswith(suffixes):
+                    try:
+                        file_id = (entry.stat(follow_symlinks=False).st_dev, entry.inode())
+                    except OSError:
+                        # The worker reports the error when it opens the file.
+                        yield entry.path
+                        continue
+                    if file_id in seen:
+                        logger.debug("Skipping %s, a hard link to a file already processed.", entry.path)
+                        continue
+                    seen.add(file_id)
+                    yield entry.path
+    except OSError as e:
+        logger.error("An error occurred while scanning %s: %s.", directory, e)
+
+
+def compute_rules_digest(rules: ReplaceRules) -> str:
+    """
+    Computes a digest identifying the effective replacement pairs.
+
+    Args:
+        rules (ReplaceRules): Compiled replacement pairs.
+
+    Returns:
+        str: Hexadecimal SHA-256 digest.
+    """
+    return hashlib.sha256(repr(sorted(rules.replace_map.items())).encode("utf-8")).hexdigest()
+
+
+def get_file_signature(file_path: str) -> Optional[List[int]]:
+    """
+    Returns the modification time and size of a file, used to detect changes between runs.
+
+    Args:
+        file_path (str): Path to the file.
+
+    Returns:
+        Optional[List[int]]: Modification time in nanoseconds and size in bytes, or None if
+            the file cannot be accessed.
+    """
+    try:
+        stat_result = os.stat(file_path)
+    except OSError:
+        return None
+    return [stat_result.st_mtime_ns, stat_result.st_size]
+
+
+def load_file_cache(cache_path: str, rules_digest: str) -> Dict[str, List[int]]:
+    """
+    Loads the file signatures recorded by a previous run with the same replacement pairs.
+
+    Args:
+        cache_path (str): Path to the cache file.
+        rules_digest (str): Digest of the current replacement pairs.
+
+    Returns:
+        Dict[str, List[int]]: File signatures keyed by path relative to the target directory.
+            Empty if the cache is missing, unreadable or was made with other pairs.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("digest") != rules_digest:
+        return {}
+    files = cache.get("files", {})
+    if not isinstance(files, dict):
+        return {}
+    return files
+
+
+def save_file_cache(cache_path: str, rules_digest: str, files: Dict[str, List[int]]) -> None:
+    """
+    Saves the file signatures of the current run.
+
+    Args:
+        cache_path (str): Path to the cache file.
+        rules_digest (str): Digest of the current replacement pairs.
+        files (Dict[str, List[int]]): File signatures keyed by path relative to the target
+            directory.
+    """
+    temp_path = f"{cache_path}.tmp"
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"digest": rules_digest, "files": files}, f)
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        logger.error("An error occurred while saving the cache file %s: %s.", cache_path, e)
+
+
+def initialize_worker(rules: ReplaceRules, log_queue: Optional[multiprocessing.Queue], log_level: int) -> None:
+    """
+    Prepares a worker so that tasks only need to carry the paths of the files to be processed.
+
+    The compiled replacement pairs are sent once per worker and kept in worker_rules. In a
+    worker process, logging is routed to the queue drained by the main process and SIGINT
+    is ignored.
+
+    Args:
+        rules (ReplaceRules): Compiled replacement pairs.
+        log_queue (Optional[multiprocessing.Queue]): Queue shared with the main process
+            listener, or None for worker threads, which log directly.
+        log_level (int): The logging level.
+    """
+    global worker_rules
+    worker_rules = rules
+
+    if log_queue is not None:
+        # Interrupts are handled by the main process, which cancels the remaining work and
+        # removes the temporary files; a worker must not stop in the middle of a file.
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        root_logger = logging.getLogger()
+        root_logger.handlers = [QueueHandler(log_queue)]
+        root_logger.setLevel(log_level)
+
+
+def process_target_files(file_paths: List[str]) -> List[FileResult]:
+    """
+    Processes a batch of files with the replacement pairs set up by initialize_worker.
+
+    Args:
+        file_paths (List[str]): Paths of the files to be processed.
+
+    Returns:
+        List[FileResult]: Result of each file, in the same order.
+    """
+    return [find_and_replace_in_file(file_path, worker_rules) for file_path in file_paths]
+
+
+def discard_replacements(replacements: List[Tuple[str, str]], futures: List[Future]) -> None:
+    """
+    Removes the temporary files of an interrupted run that were not moved into place.
+
+    Args:
+        replacements (List[Tuple[str, str]]): Pending pairs of temporary file path and
+            original file path.
+        futures (List[Future]): Submitted batches, whose finished results may hold temporary
+            files not yet collected. Temporary files already moved into place no longer exist
+            and are skipped.
+    """
+    for temp_path, _ in replacements:
+        remove_file(temp_path)
+    for future in futures:
+        if future.done() and not future.cancelled() and future.exception() is None:
+            for result in future.result():
+                if result.temp_path is not None:
+                    remove_file(result.temp_path)
+
+
+class BufferedFileHandler(MemoryHandler):
+    """
+    Memory handler that also closes its target file handler when it is closed.
+
+    MemoryHandler.close only flushes and drops its target, which would leave the log file
+    open until the handler is garbage-collected.
+    """
+
+    def close(self) -> None:
+        """
+        Flushes the buffered records, then closes the target handler.
+        """
+        target = self.target
+        try:
+            super().close()
+        finally:
+            if target is not None:
+                target.close()
 
 
 def initialize_logging(log_level: int, destination: str) -> str:
     """
     Initializes the logging configuration and creates a log file with a UTF-8 BOM.
 
+    Log records are buffered in memory and written to the file in batches.
+
     Args:
         log_level (int): The logging level.
         destination (str): Directory where the log file will be saved.
@@ -108,14 +907,12 @@ def initialize_logging(log_level: int, destination: str) -> str:
     with open(log_file_path, "w", encoding="utf-8-sig") as log_file:
         log_file.write("\ufeff")
 
-    logging.basicConfig(
-        filename=log_file_path,
-        level=log_level,
-        format="%(asctime)s - %(levelname)s - %(message)s",
-        filemode="a",
-        encoding="utf-8-sig",
-    )
-    logging.info("Logging initialized.")
+    file_handler = logging.FileHandler(log_file_path, mode="a", encoding="utf-8-sig")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    # Records are buffered and written in batches; errors are written immediately.
+    memory_handler = BufferedFileHandler(capacity=1024, flushLevel=logging.ERROR, target=file_handler)
+    logging.basicConfig(level=log_level, handlers=[memory_handler])
+    logger.info("Logging initialized.")
     return log_file_path
 
 
@@ -155,6 +952,19 @@ def parse_arguments() -> argparse.Namespace:
         default="NONE",
         help="Set the logging level (default: NONE).",
     )
+    parser.add_argument(
+        "-c",
+        "--cache",
+        action="store_true",
+        help="Skip files unchanged since the last run with the same replacement pairs.",
+    )
+    parser.add_argument(
+        "-e",
+        "--executor",
+        choices=["process", "thread"],
+        default="process",
+        help="Run the file workers as processes or threads (default: process).",
+    )
     return parser.parse_args()
 
 
@@ -166,7 +976,7 @@ def main() -> None:
 
     csv_file_path = args.source
     target_directory = Path(args.target).resolve()
-    file_types = [ftype.lower() if ftype.startswith('.') else f".{ftype.lower()}" for ftype in args.file_type]
+    file_types = tuple(ftype.lower() if ftype.startswith('.') else f".{ftype.lower()}" for ftype in args.file_type)
     log_level = getattr(logging, args.log) if args.log != "NONE" else logging.CRITICAL
 
     if args.log != "NONE":
@@ -180,19 +990,92 @@ def main() -> None:
         find_replace_pairs = read_replace_pairs(csv_file_path)
     except ValueError as e:
         print(f"Error reading CSV file: {e}")
-        logging.error(f"Error reading CSV file: {e}")
+        logger.error("Error reading CSV file: %s", e)
         return
 
-    for root, _, files in os.walk(target_directory):
-        for file_name in files:
-            if any(file_name.lower().endswith(ext) for ext in file_types):
-                file_path = os.path.join(root, file_name)
-                for find_text, replace_text in find_replace_pairs:
-                    find_and_replace_in_file(file_path, find_text, replace_text)
+    if not any(find_text for find_text, _ in find_replace_pairs):
+        print("No replacement pairs found in the CSV file.")
+        logger.warning("No replacement pairs found in the CSV file.")
+        return
+
+    rules = compile_replace_pairs(find_replace_pairs)
+    file_paths = [
+        file_path
+        for file_path in iter_target_files(str(target_directory), file_types)
+        if os.path.basename(file_path) != CACHE_FILE_NAME
+    ]
+
+    cache_path = os.path.join(target_directory, CACHE_FILE_NAME)
+    cache_entries: Dict[str, List[int]] = {}
+    if args.cache:
+        rules_digest = compute_rules_digest(rules)
+        cached_files = load_file_cache(cache_path, rules_digest)
+        changed_paths = []
+        for file_path in file_paths:
+            cache_key = os.path.relpath(file_path, target_directory)
+            signature = get_file_signature(file_path)
+            if signature is not None and cached_files.get(cache_key) == signature:
+                cache_entries[cache_key] = signature
+            else:
+                changed_paths.append(file_path)
+        logger.info("Skipped %d unchanged file(s).", len(cache_entries))
+        file_paths = changed_paths
+
+    listener: Optional[QueueListener] = None
+    executor: Executor
+    if args.executor == "thread":
+        executor = ThreadPoolExecutor(
+            max_workers=min(64, (os.cpu_count() or 1) * 8),
+            initializer=initialize_worker,
+            initargs=(rules, None, log_level),
+        )
+    else:
+        log_queue = multiprocessing.Queue()
+        listener = QueueListener(log_queue, *logging.getLogger().handlers, respect_handler_level=True)
+        listener.start()
+        executor = ProcessPoolExecutor(initializer=initialize_worker, initargs=(rules, log_queue, log_level))
+
+    # Process workers take batches to amortize the IPC round trip; threads take single files.
+    batch_size = 1 if args.executor == "thread" else 32
+    processed_paths: List[str] = []
+    failed_paths: List[str] = []
+    pending: List[Tuple[str, str]] = []
+    try:
+        with executor:
+            futures: List[Future] = []
+            try:
+                for start in range(0, len(file_paths), batch_size):
+                    futures.append(executor.submit(process_target_files, file_paths[start:start + batch_size]))
+                for future in futures:
+                    for result in future.result():
+                        if result.processed:
+                            processed_paths.append(result.file_path)
+                        if result.temp_path is not None:
+                            pending.append((result.temp_path, result.file_path))
+                        if len(pending) >= COMMIT_BATCH_SIZE:
+                            failed_paths += commit_replacements(pending)
+                            pending = []
+                failed_paths += commit_replacements(pending)
+            except BaseException:
+                executor.shutdown(cancel_futures=True)
+                discard_replacements(pending, futures)
+                raise
+    finally:
+        if listener is not None:
+            listener.stop()
+
+    if args.cache:
+        failed = set(failed_paths)
+        for file_path in processed_paths:
+            signature = get_file_signature(file_path) if file_path not in failed else None
+            if signature is not None:
+                cache_entries[os.path.relpath(file_path, target_directory)] = signature
+        save_file_cache(cache_path, rules_digest, cache_entries)
 
-    logging.info("Replacement operation completed.")
+    logger.info("Replacement operation completed.")
     print("Replacement operation completed.")
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,179 @@
+import json
+import os
+import random
+import re
+import tempfile
+import unittest
+from collections import Counter
+from unittest import mock
+
+import batrepl
+
+
+def random_text(rng: random.Random, alphabet: str, min_length: int, max_length: int) -> str:
+    return "".join(rng.choice(alphabet) for _ in range(rng.randint(min_length, max_length)))
+
+
+class BuildTriePatternTest(unittest.TestCase):
+    def test_matches_longest_first_alternation(self) -> None:
+        rng = random.Random(2)
+        # Includes characters that are special in patterns and character classes.
+        alphabet = "ab.c]-^\\"
+        for _ in range(3000):
+            finds = {random_text(rng, alphabet, 1, 6).encode() for _ in range(rng.randint(1, 8))}
+            find_bytes = tuple(sorted(finds, key=len, reverse=True))
+            expected_pattern = re.compile(b"|".join(re.escape(find) for find in find_bytes))
+            trie_pattern = re.compile(batrepl.build_trie_pattern(find_bytes))
+            data = random_text(rng, alphabet, 0, 80).encode()
+
+            expected = [(match.start(), match.group()) for match in expected_pattern.finditer(data)]
+            actual = [(match.start(), match.group()) for match in trie_pattern.finditer(data)]
+            self.assertEqual(actual, expected, (find_bytes, data))
+
+    def test_prefers_longest_match(self) -> None:
+        rules = batrepl.compile_replace_pairs([("foo", "1"), ("foobar", "2"), ("fo", "3")])
+        self.assertEqual(rules.pattern.findall(b"foobar foob fo"), [b"foobar", b"foo", b"fo"])
+
+    def test_deeply_nested_find_texts(self) -> None:
+        rules = batrepl.compile_replace_pairs([("a" * length, str(length)) for length in range(1, 1001)])
+        self.assertEqual(rules.pattern.findall(b"a" * 1003), [b"a" * 1000, b"aaa"])
+
+
+class ReplaceStreamingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "target.txt")
+        self.temp_path = self.file_path + ".tmp"
+
+    def stream(self, data: bytes, rules: batrepl.ReplaceRules, chunk_size: int) -> bytes:
+        with open(self.file_path, "wb") as f:
+            f.write(data)
+        with mock.patch.object(batrepl, "CHUNK_SIZE", chunk_size):
+            changed = batrepl.replace_streaming(self.file_path, rules, Counter(), self.temp_path)
+        if not changed:
+            self.assertFalse(os.path.exists(self.temp_path))
+            return data
+        with open(self.temp_path, "rb") as f:
+            return f.read()
+
+    def test_matches_whole_buffer_replacement(self) -> None:
+        rng = random.Random(1)
+        for _ in range(3000):
+            pairs = [
+                (random_text(rng, "abc", 1, 5), random_text(rng, "xyzab", 0, 4))
+                for _ in range(rng.randint(1, 5))
+            ]
+            rules = batrepl.compile_replace_pairs(pairs)
+            data = random_text(rng, "abc", 0, 60).encode()
+            chunk_size = rng.randint(1, 7)
+
+            expected = rules.pattern.sub(lambda match: rules.replace_map[match[0]], data)
+            self.assertEqual(self.stream(data, rules, chunk_size), expected, (pairs, data, chunk_size))
+
+    def test_match_spanning_chunk_boundary(self) -> None:
+        rules = batrepl.compile_replace_pairs([("boundary", "B"), ("bound", "b")])
+        data = b"xxxxxboundaryxxboundxx"
+        for chunk_size in range(1, len(data) + 1):
+            self.assertEqual(self.stream(data, rules, chunk_size), b"xxxxxBxxbxx")
+
+
+class FindAndReplaceInFileTest(unittest.TestCase):
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.file_path = os.path.join(temp_dir.name, "target.txt")
+        with open(self.file_path, "wb") as f:
+            f.write(b"foo bar")
+        self.rules = batrepl.compile_replace_pairs([("foo", "baz")])
+
+    def read(self, path: str) -> bytes:
+        with open(path, "rb") as f:
+            return f.read()
+
+    @unittest.skipUnless(hasattr(os, "link"), "hard links are not supported")
+    def test_hard_linked_file_is_written_in_place(self) -> None:
+        link_path = self.file_path + ".link"
+        os.link(self.file_path, link_path)
+        result = batrepl.find_and_replace_in_file(self.file_path, self.rules)
+
+        self.assertEqual(result, batrepl.FileResult(self.file_path, True, None))
+        self.assertEqual(self.read(link_path), b"baz bar")
+        self.assertTrue(os.path.samefile(self.file_path, link_path))
+
+    def test_temporary_file_keeps_permissions(self) -> None:
+        os.chmod(self.file_path, 0o640)
+        result = batrepl.find_and_replace_in_file(self.file_path, self.rules)
+
+        self.assertTrue(result.processed)
+        self.assertEqual(self.read(result.temp_path), b"baz bar")
+        self.assertEqual(os.stat(result.temp_path).st_mode, os.stat(self.file_path).st_mode)
+
+    def test_read_only_file_is_not_replaced(self) -> None:
+        with mock.patch.object(batrepl.os, "access", return_value=False):
+            result = batrepl.find_and_replace_in_file(self.file_path, self.rules)
+
+        self.assertEqual(result, batrepl.FileResult(self.file_path, False, None))
+        self.assertEqual(self.read(self.file_path), b"foo bar")
+        self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ["target.txt"])
+
+    def test_file_in_read_only_directory_is_written_in_place(self) -> None:
+        real_open = open
+        opened_paths = []
+
+        def deny_sibling(path, *args, **kwargs):
+            if str(path).startswith(self.file_path + ".batrepl."):
+                raise PermissionError(13, "Permission denied", path)
+            opened_paths.append(path)
+            return real_open(path, *args, **kwargs)
+
+        for stream_threshold in (batrepl.STREAM_THRESHOLD, 0):
+            with self.subTest(stream_threshold=stream_threshold):
+                with real_open(self.file_path, "wb") as f:
+                    f.write(b"foo bar")
+                inode = os.stat(self.file_path).st_ino
+                with mock.patch("builtins.open", side_effect=deny_sibling), mock.patch.object(
+                    batrepl, "STREAM_THRESHOLD", stream_threshold
+                ):
+                    result = batrepl.find_and_replace_in_file(self.file_path, self.rules)
+
+                self.assertEqual(result, batrepl.FileResult(self.file_path, True, None))
+                self.assertEqual(self.read(self.file_path), b"baz bar")
+                self.assertEqual(os.stat(self.file_path).st_ino, inode)
+                self.assertEqual(os.listdir(os.path.dirname(self.file_path)), ["target.txt"])
+                self.assertFalse(any(os.path.exists(path) for path in opened_paths if path != self.file_path))
+
+
+class IterTargetFilesTest(unittest.TestCase):
+    @unittest.skipUnless(hasattr(os, "link"), "hard links are not supported")
+    def test_hard_links_are_yielded_once(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        os.mkdir(os.path.join(temp_dir.name, "sub"))
+        file_path = os.path.join(temp_dir.name, "a.txt")
+        link_path = os.path.join(temp_dir.name, "sub", "b.txt")
+        other_path = os.path.join(temp_dir.name, "c.txt")
+        for path in (file_path, other_path):
+            with open(path, "wb") as f:
+                f.write(b"foo")
+        os.link(file_path, link_path)
+
+        paths = list(batrepl.iter_target_files(temp_dir.name, (".txt",)))
+        self.assertEqual(len(paths), 2)
+        self.assertIn(other_path, paths)
+        self.assertTrue(file_path in paths or link_path in paths)
+
+
+class LoadFileCacheTest(unittest.TestCase):
+    def test_malformed_files_are_ignored(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        cache_path = os.path.join(temp_dir.name, batrepl.CACHE_FILE_NAME)
+        for files in ([], "files", None, 1):
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump({"digest": "abc", "files": files}, f)
+            self.assertEqual(batrepl.load_file_cache(cache_path, "abc"), {})
+
+
+if __name__ == "__main__":
+    unittest.main()